@@ -9,25 +9,88 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import heapq
 import time
+import threading
+import tempfile
+import requests
+from urllib.parse import urlparse
 from datetime import datetime, timedelta
+from math import radians, cos, sin, asin, sqrt
 from obspy import UTCDateTime
 from obspy.clients.fdsn import Client
-from obspy.clients.fdsn.header import FDSNException
+from obspy.clients.fdsn.header import FDSNException, FDSNTooManyRequestsException
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import warnings
 warnings.filterwarnings('ignore')
 
+# Station epoch window used for every inventory query
+INVENTORY_STARTTIME = UTCDateTime("2010-01-01")
+INVENTORY_ENDTIME = UTCDateTime("2024-01-01")
+
+# IRIS federator routing service, used to find which data center holds each station
+FEDCATALOG_URL = "https://service.iris.edu/irisws/fedcatalog/1/query"
+
+# Hosts the federator may report for a data center under a different name than its client uses
+HOST_ALIASES = {'service.iris.edu': 'service.earthscope.org'}
+
+class RateLimiter:
+    """Thread-safe token bucket that paces requests to one FDSN host"""
+    def __init__(self, rate_per_sec=2.0, burst=4):
+        self.rate = rate_per_sec
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.backoff_delay = 1.0
+        self.backoff_until = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                wait = self.backoff_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def back_off(self):
+        """Pause all requests to this host, doubling the pause on repeated throttling"""
+        with self.lock:
+            self.backoff_until = time.monotonic() + self.backoff_delay
+            self.backoff_delay = min(self.backoff_delay * 2, 60.0)
+    
+    def reset_backoff(self):
+        """Reset the backoff delay after a successful request"""
+        with self.lock:
+            self.backoff_delay = 1.0
+
 class SeismicDataFetcher:
-    def __init__(self, data_dir='seismic_station_data'):
+    def __init__(self, data_dir='seismic_station_data', max_workers=4):
         self.data_dir = data_dir
+        self.max_workers = max_workers  # Concurrent waveform requests per event
         self.clients = {}
+        self.rate_limiters = {}  # Per-host request pacing, keyed by client name
+        
+        # Per-thread tag prefixed to log lines, so output from parallel events stays attributable
+        self.event_context = threading.local()
+        
+        # Station inventories keyed by rounded location and radius
+        self.station_cache = {}
+        self.station_cache_dir = os.path.join(data_dir, 'station_cache')
         
         # Initialize FDSN clients for different data centers
         self.init_clients()
         
         # Create main data directory
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
     
     def init_clients(self):
         """Initialize FDSN clients for different seismic data centers"""
@@ -44,68 +107,85 @@ class SeismicDataFetcher:
             'JMA': 'JMA'       # Japan
         }
         
-        for name, url in client_urls.items():
+        def connect(url):
             try:
-                self.clients[name] = Client(url)
-                print(f"Initialized {name} client")
+                return Client(url), None
             except Exception as e:
-                print(f"Failed to initialize {name} client: {e}")
+                return None, e
+        
+        # Each Client performs its own service discovery, so connect in parallel
+        with ThreadPoolExecutor(max_workers=len(client_urls)) as executor:
+            results = executor.map(connect, client_urls.values())
+            
+            for name, (client, error) in zip(client_urls, results):
+                if client is not None:
+                    self.clients[name] = client
+                    print(f"Initialized {name} client")
+                else:
+                    print(f"Failed to initialize {name} client: {error}")
         
         if not self.clients:
             print("Warning: No FDSN clients could be initialized!")
         else:
             print(f"Successfully initialized {len(self.clients)} FDSN clients")
     
+    def log(self, message):
+        """Print a message prefixed with the current thread's event tag"""
+        print(f"{getattr(self.event_context, 'tag', '')}{message}")
+    
+    def rate_limited_request(self, client_name, method, max_retries=3, **kwargs):
+        """
+        Call an FDSN client method through its host's rate limiter, backing off on HTTP 429
+        """
+        limiter = self.rate_limiters.setdefault(client_name, RateLimiter())
+        
+        for attempt in range(max_retries):
+            limiter.acquire()
+            try:
+                result = method(**kwargs)
+                limiter.reset_backoff()
+                return result
+            except FDSNTooManyRequestsException:
+                if attempt == max_retries - 1:
+                    raise
+                self.log(f"        {client_name} is throttling requests, backing off...")
+                limiter.back_off()
+    
     def get_nearest_stations(self, latitude, longitude, max_radius_km=500, max_stations=5):
         """
         Find nearest seismic stations using ObsPy FDSN clients
         """
-        all_stations = []
+        # Nearby events share an inventory query (key resolution ~0.1 degrees)
+        cache_key = f"{latitude:.1f}_{longitude:.1f}_{max_radius_km}"
+        all_stations = self.get_cached_stations(cache_key)
         
-        # Try each client to get station inventory
-        for client_name, client in self.clients.items():
-            try:
-                print(f"  Querying {client_name} for stations...")
-                
-                # Get station inventory
-                inventory = client.get_stations(
-                    latitude=latitude, 
-                    longitude=longitude,
-                    maxradius=max_radius_km / 111.32,  # Convert km to degrees
-                    level="station",
-                    starttime=UTCDateTime("2010-01-01"),
-                    endtime=UTCDateTime("2024-01-01")
-                )
-                
-                # Extract station information
-                for network in inventory:
-                    for station in network:
-                        distance = self.calculate_distance(
-                            latitude, longitude,
-                            station.latitude, station.longitude
-                        )
-                        
-                        all_stations.append({
-                            'network': network.code,
-                            'station': station.code,
-                            'latitude': station.latitude,
-                            'longitude': station.longitude,
-                            'distance_km': distance,
-                            'client': client_name,
-                            'site_name': station.site.name if station.site else 'Unknown',
-                            'elevation': station.elevation
-                        })
-                        
-            except Exception as e:
-                print(f"    Error querying {client_name}: {e}")
-                continue
+        if all_stations is None:
+            all_stations = self.query_station_inventories(latitude, longitude, max_radius_km)
+            if all_stations:
+                self.cache_stations(cache_key, all_stations)
+        else:
+            self.log(f"  Using cached station inventory ({len(all_stations)} stations)")
+        
+        if all_stations:
+            # Distances are always computed from this event's own coordinates, and a
+            # cached inventory may be centred on another point in the same cell
+            distances = self.calculate_distances(
+                latitude, longitude,
+                [station['latitude'] for station in all_stations],
+                [station['longitude'] for station in all_stations]
+            )
+            all_stations = [
+                dict(station, distance_km=float(distance))
+                for station, distance in zip(all_stations, distances)
+                if distance <= max_radius_km
+            ]
         
-        # If no stations found from clients, use fallback
         if not all_stations:
-            print("  No stations found from FDSN clients, using fallback stations...")
+            # If no stations found from clients, use fallback
+            self.log("  No stations found from FDSN clients, using fallback stations...")
             all_stations = self.get_fallback_stations(latitude, longitude, max_radius_km)
         
-        # Remove duplicates and sort by distance
+        # Remove duplicates and keep the nearest stations
         unique_stations = []
         seen = set()
         for station in all_stations:
@@ -114,8 +194,150 @@ class SeismicDataFetcher:
                 seen.add(key)
                 unique_stations.append(station)
         
-        unique_stations.sort(key=lambda x: x['distance_km'])
-        return unique_stations[:max_stations]
+        return heapq.nsmallest(max_stations, unique_stations, key=lambda x: x['distance_km'])
+    
+    def query_station_inventories(self, latitude, longitude, max_radius_km):
+        """
+        Query FDSN services for stations within the radius
+        """
+        query = {
+            'latitude': latitude,
+            'longitude': longitude,
+            'maxradius': max_radius_km / 111.32,  # Convert km to degrees
+            'level': "station",
+            'starttime': INVENTORY_STARTTIME,
+            'endtime': INVENTORY_ENDTIME
+        }
+        
+        # One federator lookup routes the query to the data centers that hold stations
+        # here; only the configured clients are queried, so every station stays fetchable
+        routes = self.route_stations(query)
+        if routes:
+            all_stations = []
+            for client_name, bulk in routes.items():
+                try:
+                    self.log(f"  Querying {client_name} for {len(bulk)} federator-routed stations...")
+                    inventory = self.rate_limited_request(
+                        client_name, self.clients[client_name].get_stations_bulk, bulk=bulk, level="station"
+                    )
+                    all_stations.extend(self.extract_inventory_stations(inventory, client_name))
+                except Exception as e:
+                    self.log(f"    Error querying {client_name}: {e}")
+            if all_stations:
+                return all_stations
+        
+        all_stations = []
+        
+        # Fall back to querying each client for its station inventory
+        for client_name, client in self.clients.items():
+            try:
+                self.log(f"  Querying {client_name} for stations...")
+                inventory = self.rate_limited_request(client_name, client.get_stations, **query)
+                all_stations.extend(self.extract_inventory_stations(inventory, client_name))
+            except Exception as e:
+                self.log(f"    Error querying {client_name}: {e}")
+                continue
+        
+        return all_stations
+    
+    def route_stations(self, query):
+        """
+        Ask the IRIS federator which configured clients hold stations matching the query.
+        Returns {client_name: bulk request lines}, or an empty dict if routing fails.
+        """
+        hosts = {}
+        for client_name, client in self.clients.items():
+            host = urlparse(client.base_url).netloc
+            hosts[HOST_ALIASES.get(host, host)] = client_name
+        
+        params = {key: str(value) for key, value in query.items()}
+        params['format'] = 'request'
+        
+        try:
+            self.log("  Querying IRIS federator for stations...")
+            response = self.rate_limited_request('FEDERATOR', requests.get, url=FEDCATALOG_URL, params=params, timeout=60)
+            # The federator answers 204 when no data center has matching stations
+            if response.status_code != 200:
+                return {}
+        except Exception as e:
+            self.log(f"    Error querying IRIS federator: {e}")
+            return {}
+        
+        routes = {}
+        seen = set()
+        client_name = None
+        for line in response.text.splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('DATACENTER='):
+                client_name = None
+            elif line.startswith('STATIONSERVICE='):
+                host = urlparse(line.split('=', 1)[1]).netloc
+                client_name = hosts.get(HOST_ALIASES.get(host, host))
+            elif '=' not in line and client_name is not None:
+                # Request lines are "NET STA LOC CHA START END"; one entry per station is enough
+                network, station = line.split()[:2]
+                if (client_name, network, station) not in seen:
+                    seen.add((client_name, network, station))
+                    routes.setdefault(client_name, []).append(
+                        [network, station, '*', '*', INVENTORY_STARTTIME, INVENTORY_ENDTIME]
+                    )
+        
+        return routes
+    
+    def extract_inventory_stations(self, inventory, client_name):
+        """
+        Flatten an ObsPy inventory into station dictionaries
+        """
+        return [
+            {
+                'network': network.code,
+                'station': station.code,
+                'latitude': station.latitude,
+                'longitude': station.longitude,
+                'client': client_name,
+                'site_name': station.site.name if station.site else 'Unknown',
+                'elevation': station.elevation
+            }
+            for network in inventory
+            for station in network
+        ]
+    
+    def get_cached_stations(self, cache_key):
+        """
+        Look up a station inventory in the memory cache, then on disk
+        """
+        if cache_key in self.station_cache:
+            return self.station_cache[cache_key]
+        
+        cache_file = os.path.join(self.station_cache_dir, f'{cache_key}.json')
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    self.station_cache[cache_key] = json.load(f)
+                return self.station_cache[cache_key]
+            except Exception as e:
+                self.log(f"  Error reading station cache {cache_file}: {e}")
+        
+        return None
+    
+    def cache_stations(self, cache_key, stations):
+        """
+        Store a station inventory in the memory cache and on disk
+        """
+        self.station_cache[cache_key] = stations
+        
+        try:
+            os.makedirs(self.station_cache_dir, exist_ok=True)
+            
+            # Write to a private temp file and swap it in, so parallel events never
+            # leave a partially written cache file behind
+            with tempfile.NamedTemporaryFile('w', dir=self.station_cache_dir, suffix='.tmp', delete=False) as f:
+                json.dump(stations, f)
+            os.replace(f.name, os.path.join(self.station_cache_dir, f'{cache_key}.json'))
+        except Exception as e:
+            self.log(f"  Error writing station cache: {e}")
     
     def get_stations_iris_text(self, latitude, longitude, max_radius_km):
         """
@@ -209,15 +431,16 @@ class SeismicDataFetcher:
             {'network': 'AU', 'station': 'EIDS', 'latitude': -26.3912, 'longitude': 116.7975}, # Australia
         ]
         
+        distances = self.calculate_distances(
+            latitude, longitude,
+            [station['latitude'] for station in global_stations],
+            [station['longitude'] for station in global_stations]
+        )
+        
         stations = []
-        for station in global_stations:
-            distance = self.calculate_distance(
-                latitude, longitude, 
-                station['latitude'], station['longitude']
-            )
-            
+        for station, distance in zip(global_stations, distances):
             if distance <= max_radius_km:
-                station['distance_km'] = distance
+                station['distance_km'] = float(distance)
                 station['client'] = 'IRIS'  # Default client
                 station['site_name'] = 'Global Station'
                 station['elevation'] = 0.0
@@ -290,8 +513,6 @@ class SeismicDataFetcher:
         """
         Calculate distance between two points using Haversine formula
         """
-        from math import radians, cos, sin, asin, sqrt
-        
         # Convert to radians
         lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
         
@@ -304,47 +525,78 @@ class SeismicDataFetcher:
         
         return c * r
     
-    def get_seismic_waveforms(self, network, station, start_time, end_time, channels=['BHZ', 'HHZ', 'BHN', 'BHE']):
+    def calculate_distances(self, latitude, longitude, lats, lons):
+        """
+        Calculate Haversine distances from one point to arrays of points in a single pass
+        """
+        lat1, lon1 = np.radians(latitude), np.radians(longitude)
+        lats, lons = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lons, dtype=float))
+        
+        a = np.sin((lats - lat1) / 2)**2 + np.cos(lat1) * np.cos(lats) * np.sin((lons - lon1) / 2)**2
+        return 2 * 6371 * np.arcsin(np.sqrt(a))  # Earth radius in kilometers
+    
+    def get_seismic_waveforms(self, network, station, start_time, end_time, channels=['BHZ', 'HHZ', 'BHN', 'BHE'], preferred_client=None):
         """
         Fetch actual seismic waveform data using ObsPy
         """
-        waveforms = None
+        # Convert to UTCDateTime unless the caller already did
+        starttime = start_time if isinstance(start_time, UTCDateTime) else UTCDateTime(start_time)
+        endtime = end_time if isinstance(end_time, UTCDateTime) else UTCDateTime(end_time)
         
-        # Convert to UTCDateTime
-        starttime = UTCDateTime(start_time)
-        endtime = UTCDateTime(end_time)
+        # Request all channels in one call per client (FDSN accepts comma-separated lists)
+        combined = ','.join(channels)
         
-        # Try different clients and channels
-        for client_name, client in self.clients.items():
-            for channel in channels:
-                try:
-                    print(f"        Trying {client_name} for {network}.{station}.{channel}...")
-                    
-                    # Get waveform data
-                    waveforms = client.get_waveforms(
-                        network=network,
-                        station=station,
-                        location="*",  # Try all locations
-                        channel=channel,
-                        starttime=starttime,
-                        endtime=endtime
-                    )
-                    
-                    if waveforms and len(waveforms) > 0:
-                        print(f"        Success! Got {len(waveforms)} traces from {client_name}")
+        # Try the data center the station was found at first, then the others
+        clients = sorted(self.clients.items(), key=lambda item: item[0] != preferred_client)
+        for client_name, client in clients:
+            waveforms, failed = self.request_waveforms(client_name, client, network, station, combined, starttime, endtime)
+            if waveforms:
+                return waveforms, client_name
+            
+            # A data center may reject the larger combined request; retry one channel at a time
+            if failed and len(channels) > 1:
+                self.log(f"        Retrying {client_name} one channel at a time...")
+                for channel in channels:
+                    waveforms, _ = self.request_waveforms(client_name, client, network, station, channel, starttime, endtime)
+                    if waveforms:
                         return waveforms, client_name
-                        
-                except FDSNException as e:
-                    if "No data available" not in str(e):
-                        print(f"        FDSN error: {e}")
-                except Exception as e:
-                    print(f"        Error: {e}")
-                
-                # Small delay between requests
-                time.sleep(0.5)
         
         return None, None
     
+    def request_waveforms(self, client_name, client, network, station, channel, starttime, endtime):
+        """
+        Request waveforms for one channel selection from one client.
+        Returns (waveforms, failed), where failed means an error other than missing data.
+        """
+        try:
+            self.log(f"        Trying {client_name} for {network}.{station}.{channel}...")
+            
+            # Get waveform data
+            waveforms = self.rate_limited_request(
+                client_name, client.get_waveforms,
+                network=network,
+                station=station,
+                location="*",  # Try all locations
+                channel=channel,
+                starttime=starttime,
+                endtime=endtime
+            )
+            
+            if waveforms and len(waveforms) > 0:
+                self.log(f"        Success! Got {len(waveforms)} traces from {client_name}")
+                return waveforms, False
+                
+        except FDSNException as e:
+            if "No data available" in str(e):
+                return None, False
+            self.log(f"        FDSN error: {e}")
+            return None, True
+        except Exception as e:
+            self.log(f"        Error: {e}")
+            return None, True
+        
+        return None, False
+    
     def save_waveform_data(self, waveforms, filepath, format='MSEED'):
         """
         Save waveform data to file
@@ -353,7 +605,7 @@ class SeismicDataFetcher:
             waveforms.write(filepath, format=format)
             return True
         except Exception as e:
-            print(f"Error saving waveforms: {e}")
+            self.log(f"Error saving waveforms: {e}")
             return False
     
     def create_waveform_summary(self, waveforms):
@@ -370,23 +622,27 @@ class SeismicDataFetcher:
         }
         
         for trace in waveforms:
+            stats = trace.stats
+            starttime = str(stats.starttime)
+            endtime = str(stats.endtime)
+            
             trace_info = {
-                'network': trace.stats.network,
-                'station': trace.stats.station,
-                'location': trace.stats.location,
-                'channel': trace.stats.channel,
-                'sampling_rate': trace.stats.sampling_rate,
-                'npts': trace.stats.npts,
-                'starttime': str(trace.stats.starttime),
-                'endtime': str(trace.stats.endtime),
-                'duration_hours': (trace.stats.endtime - trace.stats.starttime) / 3600.0
+                'network': stats.network,
+                'station': stats.station,
+                'location': stats.location,
+                'channel': stats.channel,
+                'sampling_rate': stats.sampling_rate,
+                'npts': stats.npts,
+                'starttime': starttime,
+                'endtime': endtime,
+                'duration_hours': (stats.endtime - stats.starttime) / 3600.0
             }
             
             summary['traces'].append(trace_info)
-            summary['sampling_rates'].append(trace.stats.sampling_rate)
-            summary['channels'].add(trace.stats.channel)
-            summary['start_times'].append(str(trace.stats.starttime))
-            summary['end_times'].append(str(trace.stats.endtime))
+            summary['sampling_rates'].append(stats.sampling_rate)
+            summary['channels'].add(stats.channel)
+            summary['start_times'].append(starttime)
+            summary['end_times'].append(endtime)
         
         # Convert sets to lists for JSON serialization
         summary['channels'] = list(summary['channels'])
@@ -423,10 +679,31 @@ class SeismicDataFetcher:
             print(f"Error fetching catalog data: {e}")
             return None
     
+    def fetch_station_period(self, network, station_code, period, start_time, end_time, output_dir, event_tag='', preferred_client=None):
+        """
+        Fetch and save waveforms for one station and time period, returning their summary
+        """
+        self.event_context.tag = event_tag
+        self.log(f"      Fetching {period}-event waveforms for {network}.{station_code}...")
+        waveforms, client_name = self.get_seismic_waveforms(
+            network, station_code, start_time, end_time, preferred_client=preferred_client
+        )
+        if not waveforms:
+            return None
+        
+        filepath = os.path.join(output_dir, f'{network}_{station_code}_{period}.mseed')
+        if not self.save_waveform_data(waveforms, filepath):
+            return None
+        
+        self.log(f"        Saved {len(waveforms)} {period}-event traces for {network}.{station_code} from {client_name}")
+        return self.create_waveform_summary(waveforms)
+    
     def process_earthquake(self, row, index, total):
         """
         Process a single earthquake event and fetch seismic data
         """
+        self.event_context.tag = f"[Event {index}] "
+        
         try:
             # Extract earthquake information
             title = row['title']
@@ -436,7 +713,7 @@ class SeismicDataFetcher:
             longitude = row['longitude']
             location = row['location']
             
-            print(f"Processing {index}/{total}: {title}")
+            self.log(f"Processing {index}/{total}: {title}")
             
             # Parse datetime
             try:
@@ -445,7 +722,7 @@ class SeismicDataFetcher:
                 try:
                     event_time = pd.to_datetime(date_str)
                 except:
-                    print(f"Could not parse date: {date_str}")
+                    self.log(f"Could not parse date: {date_str}")
                     return None
             
             # Create safe directory name
@@ -455,7 +732,7 @@ class SeismicDataFetcher:
             event_dir = os.path.join(self.data_dir, f"{event_time.strftime('%Y%m%d_%H%M')}_M{magnitude}_{safe_title}")
             
             if os.path.exists(event_dir):
-                print(f"Directory already exists, skipping: {safe_title}")
+                self.log(f"Directory already exists, skipping: {safe_title}")
                 return event_dir
             
             os.makedirs(event_dir, exist_ok=True)
@@ -467,11 +744,11 @@ class SeismicDataFetcher:
             after_end = event_time + timedelta(days=30)
             
             # Find nearest stations
-            print(f"  Finding nearest stations...")
+            self.log(f"  Finding nearest stations...")
             stations = self.get_nearest_stations(latitude, longitude)
             
             if not stations:
-                print(f"  No stations found near {location}")
+                self.log(f"  No stations found near {location}")
                 # Save metadata anyway
                 metadata = {
                     'event_info': {
@@ -502,7 +779,7 @@ class SeismicDataFetcher:
                 
                 return event_dir
             
-            print(f"  Found {len(stations)} stations")
+            self.log(f"  Found {len(stations)} stations")
             
             # Create subdirectories
             before_dir = os.path.join(event_dir, 'before_event')
@@ -511,59 +788,49 @@ class SeismicDataFetcher:
             os.makedirs(after_dir, exist_ok=True)
             
             # Fetch seismic waveform data from stations
+            # All station/period requests run concurrently, bounded by max_workers
+            # Convert each window to UTCDateTime once, shared by all stations
+            periods = {
+                'before': (UTCDateTime(before_start), UTCDateTime(before_end), before_dir),
+                'after': (UTCDateTime(after_start), UTCDateTime(after_end), after_dir)
+            }
             station_data = []
-            for i, station in enumerate(stations[:3]):  # Limit to top 3 stations to avoid overwhelming
-                network = station['network']
-                station_code = station['station']
-                distance = station['distance_km']
-                client_name = station.get('client', 'Unknown')
-                
-                print(f"    Station {i+1}: {network}.{station_code} ({distance:.1f} km) via {client_name}")
-                
-                station_info = {
-                    'network': network,
-                    'station': station_code,
-                    'latitude': station['latitude'],
-                    'longitude': station['longitude'],
-                    'distance_km': distance,
-                    'client': client_name,
-                    'site_name': station.get('site_name', 'Unknown'),
-                    'elevation': station.get('elevation', 0.0),
-                    'data_available': {'before': False, 'after': False},
-                    'waveform_summary': {'before': None, 'after': None}
-                }
-                
-                # Fetch before event waveform data
-                print(f"      Fetching before-event waveforms...")
-                before_waveforms, before_client = self.get_seismic_waveforms(
-                    network, station_code, before_start, before_end
-                )
-                if before_waveforms:
-                    before_file = os.path.join(before_dir, f'{network}_{station_code}_before.mseed')
-                    if self.save_waveform_data(before_waveforms, before_file):
-                        station_info['data_available']['before'] = True
-                        station_info['waveform_summary']['before'] = self.create_waveform_summary(before_waveforms)
-                        print(f"        Saved {len(before_waveforms)} traces from {before_client}")
-                
-                # Small delay to be respectful to servers
-                time.sleep(2)
-                
-                # Fetch after event waveform data
-                print(f"      Fetching after-event waveforms...")
-                after_waveforms, after_client = self.get_seismic_waveforms(
-                    network, station_code, after_start, after_end
-                )
-                if after_waveforms:
-                    after_file = os.path.join(after_dir, f'{network}_{station_code}_after.mseed')
-                    if self.save_waveform_data(after_waveforms, after_file):
-                        station_info['data_available']['after'] = True
-                        station_info['waveform_summary']['after'] = self.create_waveform_summary(after_waveforms)
-                        print(f"        Saved {len(after_waveforms)} traces from {after_client}")
-                
-                station_data.append(station_info)
+            futures = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for i, station in enumerate(stations[:3]):  # Limit to top 3 stations to avoid overwhelming
+                    network = station['network']
+                    station_code = station['station']
+                    distance = station['distance_km']
+                    client_name = station.get('client', 'Unknown')
+                    
+                    self.log(f"    Station {i+1}: {network}.{station_code} ({distance:.1f} km) via {client_name}")
+                    
+                    station_info = {
+                        'network': network,
+                        'station': station_code,
+                        'latitude': station['latitude'],
+                        'longitude': station['longitude'],
+                        'distance_km': distance,
+                        'client': client_name,
+                        'site_name': station.get('site_name', 'Unknown'),
+                        'elevation': station.get('elevation', 0.0),
+                        'data_available': {'before': False, 'after': False},
+                        'waveform_summary': {'before': None, 'after': None}
+                    }
+                    station_data.append(station_info)
+                    
+                    for period, (start, end, output_dir) in periods.items():
+                        future = executor.submit(
+                            self.fetch_station_period, network, station_code, period, start, end, output_dir,
+                            self.event_context.tag, client_name
+                        )
+                        futures[future] = (station_info, period)
                 
-                # Longer delay between stations
-                time.sleep(3)
+                for future, (station_info, period) in futures.items():
+                    summary = future.result()
+                    if summary:
+                        station_info['data_available'][period] = True
+                        station_info['waveform_summary'][period] = summary
             
             # Save metadata
             metadata = {
@@ -595,19 +862,24 @@ class SeismicDataFetcher:
             with open(os.path.join(event_dir, 'metadata.json'), 'w') as f:
                 json.dump(metadata, f, indent=2)
             
-            print(f"  Completed processing: {safe_title}")
+            self.log(f"  Completed processing: {safe_title}")
             return event_dir
             
         except Exception as e:
-            print(f"Error processing earthquake {index}: {e}")
+            self.log(f"Error processing earthquake {index}: {e}")
             return None
     
-    def fetch_all_earthquake_data(self, csv_file, max_events=None, start_from=0):
+    def fetch_all_earthquake_data(self, csv_file, max_events=None, start_from=0, max_parallel_events=2):
         """
         Fetch seismic data for all earthquakes in the CSV file
         """
         print("Loading earthquake data...")
-        df = pd.read_csv(csv_file)
+        # Only parse the columns used per event
+        df = pd.read_csv(
+            csv_file,
+            usecols=['title', 'magnitude', 'date_time', 'latitude', 'longitude', 'location'],
+            dtype={'latitude': 'float64', 'longitude': 'float64', 'magnitude': 'float64'}
+        )
         
         # Filter out events with missing coordinates
         df = df.dropna(subset=['latitude', 'longitude'])
@@ -623,23 +895,39 @@ class SeismicDataFetcher:
         successful = 0
         failed = 0
         
-        # Process earthquakes sequentially to be respectful to APIs
-        for index, row in df.iterrows():
-            result = self.process_earthquake(row, index - start_from + 1, len(df))
-            
-            if result:
+        def record(future):
+            nonlocal successful, failed
+            if future.result():
                 successful += 1
             else:
                 failed += 1
             
             # Progress update
-            if (index - start_from + 1) % 10 == 0:
-                print(f"\nProgress: {index - start_from + 1}/{len(df)} events processed")
+            completed = successful + failed
+            if completed % 10 == 0:
+                print(f"\nProgress: {completed}/{len(df)} events processed")
                 print(f"Successful: {successful}, Failed: {failed}")
                 print("-" * 50)
+        
+        # Process a few earthquakes at a time; each event is independent and network-bound.
+        # Only max_parallel_events are ever queued, so an interrupt stops new requests at once.
+        executor = ThreadPoolExecutor(max_workers=max_parallel_events)
+        try:
+            pending = set()
+            for index, row in df.iterrows():
+                if len(pending) >= max_parallel_events:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future)
+                pending.add(executor.submit(self.process_earthquake, row, index - start_from + 1, len(df)))
             
-            # Respectful delay between events
-            time.sleep(3)
+            for future in as_completed(pending):
+                record(future)
+        except KeyboardInterrupt:
+            print("\nInterrupted, cancelling queued events (events in progress will finish)...")
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
         
         print(f"\n=== Processing Complete ===")
         print(f"Total events processed: {len(df)}")
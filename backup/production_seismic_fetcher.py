@@ -7,8 +7,10 @@ Fetches actual seismic waveform data for all earthquakes in the dataset
 import pandas as pd
 import json
 import os
+import heapq
 import time
 from datetime import datetime, timedelta
+from math import radians, cos, sin, asin, sqrt
 from obspy import UTCDateTime
 from obspy.clients.fdsn import Client
 from obspy.clients.fdsn.header import FDSNException
@@ -28,8 +30,7 @@ class ProductionSeismicFetcher:
             self.client = None
         
         # Create main data directory
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
         
         # Global station list (expanded for worldwide coverage)
         self.global_stations = [
@@ -74,8 +75,6 @@ class ProductionSeismicFetcher:
     
     def calculate_distance(self, lat1, lon1, lat2, lon2):
         """Calculate distance using Haversine formula"""
-        from math import radians, cos, sin, asin, sqrt
-        
         lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
         dlat = lat2 - lat1
         dlon = lon2 - lon1
@@ -99,9 +98,8 @@ class ProductionSeismicFetcher:
                 station_copy['distance_km'] = distance
                 stations.append(station_copy)
         
-        # Sort by distance and return top stations
-        stations.sort(key=lambda x: x['distance_km'])
-        return stations[:max_stations]
+        # Return the nearest stations
+        return heapq.nsmallest(max_stations, stations, key=lambda x: x['distance_km'])
     
     def get_waveforms(self, network, station, start_time, end_time):
         """Get seismic waveforms"""
@@ -294,7 +292,12 @@ class ProductionSeismicFetcher:
             return
         
         print("Loading earthquake data...")
-        df = pd.read_csv(csv_file)
+        # Only parse the columns used per event
+        df = pd.read_csv(
+            csv_file,
+            usecols=['title', 'magnitude', 'date_time', 'latitude', 'longitude', 'location'],
+            dtype={'latitude': 'float64', 'longitude': 'float64', 'magnitude': 'float64'}
+        )
         df = df.dropna(subset=['latitude', 'longitude'])
         
         if max_events:
@@ -30,7 +30,11 @@ def main():
         return
     
     # Load and show basic info about the data
-    df = pd.read_csv(csv_file)
+    df = pd.read_csv(
+        csv_file,
+        usecols=['magnitude', 'date_time', 'latitude', 'longitude'],
+        dtype={'latitude': 'float64', 'longitude': 'float64', 'magnitude': 'float64'}
+    )
     df = df.dropna(subset=['latitude', 'longitude'])
     
     print(f"Total earthquakes in dataset: {len(df)}")
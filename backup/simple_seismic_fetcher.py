@@ -9,6 +9,7 @@ import json
 import os
 import time
 from datetime import datetime, timedelta
+from math import radians, cos, sin, asin, sqrt
 from obspy import UTCDateTime
 from obspy.clients.fdsn import Client
 from obspy.clients.fdsn.header import FDSNException
@@ -28,8 +29,7 @@ class SimpleSeismicFetcher:
             self.client = None
         
         # Create main data directory
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
     
     def get_global_stations(self, latitude, longitude, max_radius_km=1000):
         """
@@ -98,8 +98,6 @@ class SimpleSeismicFetcher:
     
     def calculate_distance(self, lat1, lon1, lat2, lon2):
         """Calculate distance using Haversine formula"""
-        from math import radians, cos, sin, asin, sqrt
-        
         lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
         dlat = lat2 - lat1
         dlon = lon2 - lon1
@@ -8,10 +8,15 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import re
+import heapq
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 
+# Year of an event directory, matched anywhere in a (possibly Windows-style) path
+EVENT_YEAR_PATTERN = re.compile(r'event_(\d{4})\d*_')
+
 def analyze_event_data(event_analysis_dir):
     """
     Analyze the extracted event data to provide insights.
@@ -31,10 +36,19 @@ def analyze_event_data(event_analysis_dir):
     print(f"Processing Date: {summary['processing_date']}")
     print(f"Total Major Events Processed: {summary['total_events_processed']}")
     
-    # Analyze before/after patterns
-    events_with_before = [e for e in summary['events'] if e['before_count'] > 0]
-    events_with_after = [e for e in summary['events'] if e['after_count'] > 0]
-    events_with_both = [e for e in summary['events'] if e['before_count'] > 0 and e['after_count'] > 0]
+    # Analyze before/after patterns in a single pass over the events
+    events_with_before = []
+    events_with_after = []
+    events_with_both = []
+    for event in summary['events']:
+        has_before = event['before_count'] > 0
+        has_after = event['after_count'] > 0
+        if has_before:
+            events_with_before.append(event)
+        if has_after:
+            events_with_after.append(event)
+        if has_before and has_after:
+            events_with_both.append(event)
     
     print(f"\nEvent Pattern Analysis:")
     print(f"Events with foreshocks (before): {len(events_with_before)} ({len(events_with_before)/len(summary['events'])*100:.1f}%)")
@@ -42,34 +56,34 @@ def analyze_event_data(event_analysis_dir):
     print(f"Events with both fore- and aftershocks: {len(events_with_both)} ({len(events_with_both)/len(summary['events'])*100:.1f}%)")
     
     # Find events with most activity
-    top_before = sorted(summary['events'], key=lambda x: x['before_count'], reverse=True)[:10]
-    top_after = sorted(summary['events'], key=lambda x: x['after_count'], reverse=True)[:10]
+    top_before = heapq.nlargest(10, summary['events'], key=lambda x: x['before_count'])
+    top_after = heapq.nlargest(10, summary['events'], key=lambda x: x['after_count'])
     
     print(f"\nTop 10 Events with Most Foreshocks:")
-    for i, event in enumerate(top_before, 1):
-        if event['before_count'] > 0:
-            print(f"{i:2d}. {event['event'][:60]}... - {event['before_count']} foreshocks")
+    lines = [
+        f"{i:2d}. {event['event'][:60]}... - {event['before_count']} foreshocks"
+        for i, event in enumerate(top_before, 1) if event['before_count'] > 0
+    ]
+    if lines:
+        print("\n".join(lines))
     
     print(f"\nTop 10 Events with Most Aftershocks:")
-    for i, event in enumerate(top_after, 1):
-        if event['after_count'] > 0:
-            print(f"{i:2d}. {event['event'][:60]}... - {event['after_count']} aftershocks")
+    lines = [
+        f"{i:2d}. {event['event'][:60]}... - {event['after_count']} aftershocks"
+        for i, event in enumerate(top_after, 1) if event['after_count'] > 0
+    ]
+    if lines:
+        print("\n".join(lines))
     
     # Analyze by time periods
     events_by_decade = {}
     for event in summary['events']:
-        # Extract year from directory name (format: event_YYYYMMDD_...)
-        try:
-            dir_parts = event['directory'].split('_')
-            if len(dir_parts) >= 2 and dir_parts[1].isdigit() and len(dir_parts[1]) >= 4:
-                year = int(dir_parts[1][:4])
-            else:
-                # Skip events with invalid directory format
-                continue
-            decade = (year // 10) * 10
-        except (ValueError, IndexError):
+        # Extract year from directory name (format: .../event_YYYYMMDD_...)
+        match = EVENT_YEAR_PATTERN.search(event['directory'])
+        if not match:
             # Skip events with invalid directory format
             continue
+        decade = (int(match.group(1)) // 10) * 10
         
         if decade not in events_by_decade:
             events_by_decade[decade] = {'total': 0, 'with_before': 0, 'with_after': 0, 'before_total': 0, 'after_total': 0}
@@ -83,12 +97,16 @@ def analyze_event_data(event_analysis_dir):
         if event['after_count'] > 0:
             events_by_decade[decade]['with_after'] += 1
     
-    print(f"\nAnalysis by Decade:")
-    print(f"{'Decade':<10} {'Events':<8} {'W/Fore':<8} {'W/After':<9} {'Total Fore':<12} {'Total After':<12}")
-    print("-" * 65)
+    decade_lines = [
+        f"{'Decade':<10} {'Events':<8} {'W/Fore':<8} {'W/After':<9} {'Total Fore':<12} {'Total After':<12}",
+        "-" * 65
+    ]
     for decade in sorted(events_by_decade.keys()):
         data = events_by_decade[decade]
-        print(f"{decade}s{'':<6} {data['total']:<8} {data['with_before']:<8} {data['with_after']:<9} {data['before_total']:<12} {data['after_total']:<12}")
+        decade_lines.append(f"{decade}s{'':<6} {data['total']:<8} {data['with_before']:<8} {data['with_after']:<9} {data['before_total']:<12} {data['after_total']:<12}")
+    
+    print(f"\nAnalysis by Decade:")
+    print("\n".join(decade_lines))
     
     return {
         'summary': summary,
@@ -167,13 +185,12 @@ def create_visualization(analysis_results, output_dir):
     
     # 4. Scatter plot of before vs after counts
     ax4 = axes[1, 1]
-    before_counts = [e['before_count'] for e in analysis_results['summary']['events']]
-    after_counts = [e['after_count'] for e in analysis_results['summary']['events']]
+    counts = np.array([(e['before_count'], e['after_count']) for e in analysis_results['summary']['events']]).reshape(-1, 2)
     
     # Only plot events that have some activity
-    active_events = [(b, a) for b, a in zip(before_counts, after_counts) if b > 0 or a > 0]
-    if active_events:
-        before_active, after_active = zip(*active_events)
+    active_events = counts[(counts > 0).any(axis=1)]
+    before_active, after_active = active_events[:, 0], active_events[:, 1]
+    if len(active_events):
         ax4.scatter(before_active, after_active, alpha=0.6, s=30, color='purple')
     
     ax4.set_xlabel('Foreshocks Count')
@@ -9,7 +9,7 @@ import numpy as np
 import json
 import os
 import pickle
-from datetime import datetime, timedelta
+from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
@@ -34,13 +34,18 @@ class EarthquakeMLPipeline:
         self.feature_selector = None
         
         # Create output directory
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
     
     def load_and_preprocess_data(self):
         """Load earthquake data and create features for ML training."""
         print("Loading earthquake data...")
-        self.df = pd.read_csv(self.data_path)
+        # Only parse the columns used for features and labels
+        self.df = pd.read_csv(
+            self.data_path,
+            usecols=['magnitude', 'date_time', 'alert', 'tsunami', 'sig', 'nst',
+                     'dmin', 'gap', 'depth', 'latitude', 'longitude'],
+            dtype={'latitude': 'float64', 'longitude': 'float64'}
+        )
         
         # Convert date_time to datetime
         self.df['date_time'] = pd.to_datetime(self.df['date_time'], format='%d-%m-%Y %H:%M')
@@ -98,12 +103,13 @@ class EarthquakeMLPipeline:
         features_df['dmin'] = self.df['dmin'].fillna(self.df['dmin'].median())
         
         # Temporal features
-        features_df['year'] = self.df['date_time'].dt.year
-        features_df['month'] = self.df['date_time'].dt.month
-        features_df['day'] = self.df['date_time'].dt.day
-        features_df['hour'] = self.df['date_time'].dt.hour
-        features_df['day_of_year'] = self.df['date_time'].dt.dayofyear
-        features_df['day_of_week'] = self.df['date_time'].dt.dayofweek
+        dt = self.df['date_time'].dt
+        features_df['year'] = dt.year
+        features_df['month'] = dt.month
+        features_df['day'] = dt.day
+        features_df['hour'] = dt.hour
+        features_df['day_of_year'] = dt.dayofyear
+        features_df['day_of_week'] = dt.dayofweek
         
         # Seasonal features
         features_df['sin_month'] = np.sin(2 * np.pi * features_df['month'] / 12)
@@ -129,49 +135,49 @@ class EarthquakeMLPipeline:
         print(f"Created {len(features_df.columns)} features")
         return features_df
     
+    def find_regional_window_pairs(self, window_days):
+        """Find (event, earlier event) index pairs within a time window and ~500km box."""
+        times = self.df['date_time'].to_numpy()
+        lats = self.df['latitude'].to_numpy()
+        lons = self.df['longitude'].to_numpy()
+        
+        # Data is sorted by date_time, so each window is a contiguous slice [start, end)
+        starts = np.searchsorted(times, times - np.timedelta64(window_days, 'D'), side='left')
+        ends = np.searchsorted(times, times, side='left')  # excluding current event
+        counts = ends - starts
+        
+        # Expand every window slice into flat index pairs
+        events = np.repeat(np.arange(len(times)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        neighbors = np.repeat(starts, counts) + offsets
+        
+        nearby = (
+            (np.abs(lats[neighbors] - lats[events]) < 5) &  # Within ~500km
+            (np.abs(lons[neighbors] - lons[events]) < 5)
+        )
+        
+        return events[nearby], neighbors[nearby]
+    
     def calculate_recent_activity(self, window_days):
         """Calculate recent seismic activity in a sliding window."""
-        activity = []
-        for i, row in self.df.iterrows():
-            current_time = row['date_time']
-            window_start = current_time - timedelta(days=window_days)
-            
-            # Count earthquakes in the window (excluding current event)
-            recent_events = self.df[
-                (self.df['date_time'] >= window_start) & 
-                (self.df['date_time'] < current_time) &
-                (np.abs(self.df['latitude'] - row['latitude']) < 5) &  # Within ~500km
-                (np.abs(self.df['longitude'] - row['longitude']) < 5)
-            ]
-            
-            activity.append(len(recent_events))
+        events, _ = self.find_regional_window_pairs(window_days)
         
-        return activity
+        # Count earthquakes in each event's window
+        return np.bincount(events, minlength=len(self.df))
     
     def calculate_magnitude_trend(self, window_days):
         """Calculate magnitude trend in recent earthquakes."""
-        trends = []
-        for i, row in self.df.iterrows():
-            current_time = row['date_time']
-            window_start = current_time - timedelta(days=window_days)
-            
-            # Get recent earthquakes in region
-            recent_events = self.df[
-                (self.df['date_time'] >= window_start) & 
-                (self.df['date_time'] < current_time) &
-                (np.abs(self.df['latitude'] - row['latitude']) < 5) &
-                (np.abs(self.df['longitude'] - row['longitude']) < 5)
-            ]
-            
-            if len(recent_events) > 1:
-                # Calculate linear trend of magnitudes
-                x = np.arange(len(recent_events))
-                y = recent_events['magnitude'].values
-                trend = np.polyfit(x, y, 1)[0] if len(x) > 1 else 0
-            else:
-                trend = 0
-            
-            trends.append(trend)
+        events, neighbors = self.find_regional_window_pairs(window_days)
+        magnitudes = self.df['magnitude'].to_numpy()
+        
+        # Pairs are grouped by event, so each event's recent earthquakes are one contiguous run
+        bounds = np.searchsorted(events, np.arange(len(self.df) + 1))
+        
+        trends = np.zeros(len(self.df))
+        for i in np.flatnonzero(np.diff(bounds) > 1):
+            # Calculate linear trend of magnitudes
+            y = magnitudes[neighbors[bounds[i]:bounds[i + 1]]]
+            trends[i] = np.polyfit(np.arange(len(y)), y, 1)[0]
         
         return trends
     
@@ -508,8 +514,7 @@ class EarthquakeMLPipeline:
         print(f"\nSaving models for task: {task}")
         
         task_dir = os.path.join(self.output_dir, task)
-        if not os.path.exists(task_dir):
-            os.makedirs(task_dir)
+        os.makedirs(task_dir, exist_ok=True)
         
         # Save each model
         results = self.models[task]['results']
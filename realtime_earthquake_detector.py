@@ -15,6 +15,12 @@ import pickle
 import warnings
 warnings.filterwarnings('ignore')
 
+# Classification tasks with trained models
+DETECTION_TASKS = ('major_earthquake', 'significant_earthquake', 'tsunami_generating')
+
+# Alert encoding (simple mapping)
+ALERT_LEVELS = {'': 0, 'green': 1, 'yellow': 2, 'orange': 3, 'red': 4}
+
 class RealTimeEarthquakeDetector:
     def __init__(self, models_dir='ml_models'):
         # Get the directory where this script is located
@@ -178,89 +184,71 @@ class RealTimeEarthquakeDetector:
         
         return earthquakes
     
-    def engineer_features_for_detection(self, earthquake_data):
-        """Engineer features for a single earthquake for real-time detection."""
-        features = {}
+    def engineer_features_for_batch(self, df):
+        """Engineer detection features for a DataFrame of earthquakes in one vectorized pass."""
+        def column(name, default):
+            if name in df:
+                return df[name].astype(float)
+            return pd.Series(default, index=df.index, dtype=float)
+        
+        features = pd.DataFrame(index=df.index)
         
         # Basic magnitude features
-        mag = earthquake_data.get('magnitude', 0)
-        if mag is None or pd.isna(mag):
-            mag = 0
+        mag = column('magnitude', 0).fillna(0)
         features['magnitude'] = mag
         features['magnitude_squared'] = mag ** 2
         features['magnitude_log'] = np.log(mag + 1)
         
-        # Depth features
-        depth = earthquake_data.get('depth', 10)
-        if depth is None or pd.isna(depth) or depth <= 0:
-            depth = 10  # Default depth
+        # Depth features (missing or non-positive depths default to 10 km)
+        depth = column('depth', 10)
+        depth = depth.where(depth > 0, 10)
         features['depth'] = depth
         features['depth_log'] = np.log(depth + 1)
-        features['depth_normalized'] = depth / 700.0  # Normalize by typical max depth
+        features['depth_normalized'] = depth / 700.0
         
         # Geographic features
-        lat = earthquake_data.get('latitude', 0)
-        lon = earthquake_data.get('longitude', 0)
-        if lat is None or pd.isna(lat):
-            lat = 0
-        if lon is None or pd.isna(lon):
-            lon = 0
+        lat = column('latitude', 0).fillna(0)
+        lon = column('longitude', 0).fillna(0)
         features['latitude'] = lat
         features['longitude'] = lon
-        features['lat_abs'] = abs(lat)
-        features['lon_abs'] = abs(lon)
-        features['distance_from_equator'] = abs(lat)
-        features['distance_from_prime_meridian'] = abs(lon)
+        features['lat_abs'] = lat.abs()
+        features['lon_abs'] = lon.abs()
+        features['distance_from_equator'] = lat.abs()
+        features['distance_from_prime_meridian'] = lon.abs()
         
         # Significance and other features
-        sig = earthquake_data.get('sig', earthquake_data.get('significance', 0))
-        if sig is None or pd.isna(sig):
-            sig = 0
+        sig = column('sig' if 'sig' in df else 'significance', 0).fillna(0)
         features['significance'] = sig
         features['significance_log'] = np.log(sig + 1)
         
-        # Alert encoding (simple mapping)
-        alert_map = {'': 0, 'green': 1, 'yellow': 2, 'orange': 3, 'red': 4}
-        alert_value = earthquake_data.get('alert', '')
-        if pd.isna(alert_value):
-            alert_value = ''
-        features['alert_encoded'] = alert_map.get(alert_value, 0)
+        # Alert encoding
+        if 'alert' in df:
+            features['alert_encoded'] = df['alert'].map(ALERT_LEVELS).fillna(0)
+        else:
+            features['alert_encoded'] = 0
         
         # Tsunami flag
-        tsunami = earthquake_data.get('tsunami', 0)
-        if tsunami is None or pd.isna(tsunami):
-            tsunami = 0
-        features['tsunami'] = tsunami
+        features['tsunami'] = column('tsunami', 0).fillna(0)
         
         # Network features
-        nst = earthquake_data.get('nst', 0)
-        if nst is None or pd.isna(nst):
-            nst = 0
-        features['num_stations'] = nst
-        
-        gap = earthquake_data.get('gap', 180)
-        if gap is None or pd.isna(gap) or gap <= 0:
-            gap = 180
-        features['gap'] = gap
-        
-        dmin = earthquake_data.get('dmin', 1.0)
-        if dmin is None or pd.isna(dmin) or dmin <= 0:
-            dmin = 1.0
-        features['dmin'] = dmin
+        features['num_stations'] = column('nst', 0).fillna(0)
+        gap = column('gap', 180)
+        features['gap'] = gap.where(gap > 0, 180)
+        dmin = column('dmin', 1.0)
+        features['dmin'] = dmin.where(dmin > 0, 1.0)
         
         # Temporal features
-        dt = earthquake_data.get('date_time')
-        if dt is None:
-            dt = datetime.now()
-        elif isinstance(dt, str):
-            dt = pd.to_datetime(dt)
+        if 'date_time' in df:
+            dt = pd.to_datetime(df['date_time']).fillna(datetime.now()).dt
+        else:
+            dt = pd.Series(datetime.now(), index=df.index).dt
         
         features['year'] = dt.year
         features['month'] = dt.month
         features['day'] = dt.day
         features['hour'] = dt.hour
-        features['day_of_year'] = dt.timetuple().tm_yday
-        features['day_of_week'] = dt.weekday()
+        features['day_of_year'] = dt.dayofyear
+        features['day_of_week'] = dt.dayofweek
         
         # Seasonal features
         features['sin_month'] = np.sin(2 * np.pi * features['month'] / 12)
@@ -268,8 +256,7 @@ class RealTimeEarthquakeDetector:
         features['sin_hour'] = np.sin(2 * np.pi * features['hour'] / 24)
         features['cos_hour'] = np.cos(2 * np.pi * features['hour'] / 24)
         
-        # For real-time detection, we can't calculate recent activity
-        # So we'll set these to default values
+        # Recent activity is unavailable for real-time detection
         features['recent_activity_30d'] = 0
         features['recent_activity_7d'] = 0
         features['magnitude_trend_7d'] = 0
@@ -279,40 +266,46 @@ class RealTimeEarthquakeDetector:
     
     def predict_earthquake_class(self, earthquake_data, task='major_earthquake'):
         """Predict earthquake classification using trained ML model."""
+        # A single record may carry its time as a string or not at all
+        earthquake_data = dict(earthquake_data)
+        dt = earthquake_data.get('date_time')
+        if dt is None:
+            earthquake_data['date_time'] = datetime.now()
+        elif isinstance(dt, str):
+            earthquake_data['date_time'] = pd.to_datetime(dt)
+        
+        predictions = self.predict_batch(pd.DataFrame([earthquake_data]), task)
+        return predictions[0] if predictions is not None else None
+    
+    def predict_batch(self, df, task='major_earthquake'):
+        """Predict earthquake classifications for every row of a DataFrame with one model call."""
         if task not in self.loaded_models:
             print(f"Model for task '{task}' not loaded")
             return None
         
-        # Engineer features
-        features = self.engineer_features_for_detection(earthquake_data)
-        
         # Get model components
         model_data = self.loaded_models[task]
         model = model_data['model']
         scaler = model_data['scaler']
-        feature_selector = model_data['feature_selector']
         selected_features = model_data['metadata']['selected_features']
         
-        # Create feature vector in correct order
-        feature_vector = []
-        for feature_name in selected_features:
-            feature_vector.append(features.get(feature_name, 0))
-        
-        # Convert to numpy array and reshape
-        X = np.array(feature_vector).reshape(1, -1)
+        # Build the feature matrix in the trained column order
+        features = self.engineer_features_for_batch(df)
+        X = features.reindex(columns=selected_features, fill_value=0).to_numpy(dtype=float)
         
-        # Scale features
+        # Scale features and predict all rows at once
         X_scaled = scaler.transform(X)
-        
-        # Make prediction
-        prediction = model.predict(X_scaled)[0]
-        probability = model.predict_proba(X_scaled)[0] if hasattr(model, 'predict_proba') else None
-        
-        return {
-            'prediction': int(prediction),
-            'probability': probability.tolist() if probability is not None else None,
-            'confidence': max(probability) if probability is not None else None
-        }
+        predictions = model.predict(X_scaled)
+        probabilities = model.predict_proba(X_scaled) if hasattr(model, 'predict_proba') else None
+        
+        return [
+            {
+                'prediction': int(predictions[i]),
+                'probability': probabilities[i].tolist() if probabilities is not None else None,
+                'confidence': probabilities[i].max() if probabilities is not None else None
+            }
+            for i in range(len(predictions))
+        ]
     
     def monitor_earthquakes(self, interval_minutes=15, duration_hours=24):
         """Monitor earthquakes in real-time and apply ML detection."""
@@ -321,9 +314,8 @@ class RealTimeEarthquakeDetector:
         print(f"Duration: {duration_hours} hours")
         
         # Load models
-        tasks = ['major_earthquake', 'significant_earthquake', 'tsunami_generating']
         loaded_tasks = []
-        for task in tasks:
+        for task in DETECTION_TASKS:
             if self.load_trained_models(task):
                 loaded_tasks.append(task)
         
@@ -469,9 +461,8 @@ class RealTimeEarthquakeDetector:
         df['date_time'] = pd.to_datetime(df['date_time'], format='%d-%m-%Y %H:%M')
         
         # Load models
-        tasks = ['major_earthquake', 'significant_earthquake', 'tsunami_generating']
         loaded_tasks = []
-        for task in tasks:
+        for task in DETECTION_TASKS:
             if self.load_trained_models(task):
                 loaded_tasks.append(task)
         
@@ -481,23 +472,16 @@ class RealTimeEarthquakeDetector:
         
         print(f"Loaded models for: {loaded_tasks}")
         
-        # Process each earthquake
+        # Apply each ML model to all earthquakes at once
+        task_predictions = {task: self.predict_batch(df, task) for task in loaded_tasks}
+        
         results = []
-        for idx, row in df.iterrows():
-            earthquake_data = row.to_dict()
-            
-            # Apply ML models
-            predictions = {}
-            for task in loaded_tasks:
-                prediction = self.predict_earthquake_class(earthquake_data, task)
-                predictions[task] = prediction
-            
+        for i, earthquake_data in enumerate(df.to_dict(orient='records')):
             result = earthquake_data.copy()
-            result['ml_predictions'] = predictions
+            result['ml_predictions'] = {task: task_predictions[task][i] for task in loaded_tasks}
             results.append(result)
-            
-            if (idx + 1) % 100 == 0:
-                print(f"Processed {idx + 1}/{len(df)} earthquakes")
+        
+        print(f"Processed {len(df)} earthquakes")
         
         # Save results
         if output_file is None:
@@ -548,13 +532,12 @@ def main():
             
             if earthquakes:
                 # Load models and test on first few earthquakes
-                tasks = ['major_earthquake', 'significant_earthquake', 'tsunami_generating']
-                for task in tasks:
+                for task in DETECTION_TASKS:
                     detector.load_trained_models(task)
                 
                 for i, eq in enumerate(earthquakes[:5]):  # Test first 5
                     print(f"\nTesting earthquake {i+1}: {eq['title']}")
-                    for task in tasks:
+                    for task in DETECTION_TASKS:
                         if task in detector.loaded_models:
                             prediction = detector.predict_earthquake_class(eq, task)
                             if prediction:
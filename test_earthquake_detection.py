@@ -3,35 +3,47 @@
 Test script for earthquake detection models
 """
 
-from realtime_earthquake_detector import RealTimeEarthquakeDetector
+from realtime_earthquake_detector import RealTimeEarthquakeDetector, DETECTION_TASKS
+from functools import lru_cache
 import pandas as pd
 import json
 
-def test_models():
-    """Test the trained earthquake detection models."""
-    print("=== Testing Earthquake Detection Models ===")
-    
-    # Initialize detector
+@lru_cache(maxsize=1)
+def get_detector():
+    """Create one detector with all models loaded, shared by every test."""
     detector = RealTimeEarthquakeDetector()
     
     # Load all models
-    tasks = ['major_earthquake', 'significant_earthquake', 'tsunami_generating']
-    loaded_tasks = []
-    
-    for task in tasks:
+    for task in DETECTION_TASKS:
         if detector.load_trained_models(task):
-            loaded_tasks.append(task)
             print(f"✓ Loaded {task} model")
         else:
             print(f"✗ Failed to load {task} model")
     
+    return detector
+
+def test_models():
+    """Test the trained earthquake detection models."""
+    print("=== Testing Earthquake Detection Models ===")
+    
+    # Initialize detector
+    detector = get_detector()
+    loaded_tasks = [task for task in DETECTION_TASKS if task in detector.loaded_models]
+    
     if not loaded_tasks:
         print("No models loaded. Please train models first.")
         return
     
     # Load some sample data
     print("\nLoading sample earthquake data...")
-    df = pd.read_csv('earthquake_1995-2023.csv')
+    # Only the first 10 rows and the columns used for features and display are needed
+    df = pd.read_csv(
+        'earthquake_1995-2023.csv',
+        nrows=10,
+        usecols=['title', 'magnitude', 'date_time', 'location', 'alert', 'tsunami', 'sig',
+                 'nst', 'dmin', 'gap', 'depth', 'latitude', 'longitude'],
+        dtype={'latitude': 'float64', 'longitude': 'float64'}
+    )
     df['date_time'] = pd.to_datetime(df['date_time'], format='%d-%m-%Y %H:%M')
     
     # Test on first 10 earthquakes
@@ -40,16 +52,19 @@ def test_models():
     
     predictions_summary = {task: {'positive': 0, 'total': 0} for task in loaded_tasks}
     
-    for i, row in df.head(10).iterrows():
-        earthquake_data = row.to_dict()
+    # Apply each ML model to the whole sample at once
+    sample = df.head(10)
+    task_predictions = {task: detector.predict_batch(sample, task) for task in loaded_tasks}
+    
+    for i, earthquake_data in enumerate(sample.to_dict(orient='records')):
         print(f"\nEarthquake {i+1}: {earthquake_data['title']}")
         print(f"  Magnitude: {earthquake_data['magnitude']}")
         print(f"  Location: {earthquake_data['location']}")
         print(f"  Date: {earthquake_data['date_time']}")
         
-        # Apply ML models
+        # Report ML model predictions
         for task in loaded_tasks:
-            prediction = detector.predict_earthquake_class(earthquake_data, task)
+            prediction = task_predictions[task][i]
             if prediction:
                 pred_label = "POSITIVE" if prediction['prediction'] == 1 else "negative"
                 confidence = prediction['confidence']
@@ -72,7 +87,7 @@ def test_real_time_api():
     """Test real-time earthquake API fetching."""
     print("\n=== Testing Real-time API Fetching ===")
     
-    detector = RealTimeEarthquakeDetector()
+    detector = get_detector()
     
     # Fetch latest earthquakes
     print("Fetching latest earthquakes from USGS...")